@@ -3,7 +3,24 @@
 
 """The implementation of consumer-side loading."""
 
+from __future__ import annotations
+
 import importlib
+import sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from types import ModuleType
+
+# Modules that have already been looked up, mapped to None if they could not be found.
+# Caching misses avoids repeating a search of every entry on sys.path for modules that
+# are not installed. A miss is kept for the lifetime of the process.
+_resolved: dict[str, ModuleType | None] = {}
+
+
+def _initializing(module: ModuleType) -> bool:
+    """Return whether a module is still being executed by an import."""
+    return getattr(getattr(module, "__spec__", None), "_initializing", False)
 
 
 def load_library_module(module_name: str, *, prefer_system: bool = False) -> None:
@@ -11,7 +28,9 @@ def load_library_module(module_name: str, *, prefer_system: bool = False) -> Non
 
     The function allows the module to not exist so that it may be used by a consumer in
     non-pip contexts (for example, if the library is instead installed by some other
-    package manager and so no wheel exists).
+    package manager and so no wheel exists). A module that is not found is remembered
+    as missing for the rest of the process, so it will not be loaded even if it is
+    installed or added to sys.path later.
 
     Parameters
     ----------
@@ -21,10 +40,31 @@ def load_library_module(module_name: str, *, prefer_system: bool = False) -> Non
         Whether or not to try loading a system library before the local version.
 
     """
-    try:
-        module = importlib.import_module(module_name)
-    except ModuleNotFoundError:
-        pass
+    if module_name in _resolved:
+        module = _resolved[module_name]
     else:
+        # The module is usually already imported, in which case a direct lookup avoids
+        # the overhead (and the import lock) of the full import machinery. A module that
+        # another thread or a circular import is still executing goes through the import
+        # machinery, which waits for it to finish where possible.
+        module = sys.modules.get(module_name)
+        if module is None or _initializing(module):
+            try:
+                module = importlib.import_module(module_name)
+            except ModuleNotFoundError as e:
+                # Only the absence of the module itself (or one of its parent packages)
+                # means that it is not installed. Anything else missing is a real error
+                # in the module.
+                if e.name is None or not (
+                    module_name == e.name or module_name.startswith(f"{e.name}.")
+                ):
+                    raise
+                module = None
+        # A module in the middle of a circular import may not define its loader yet, so
+        # it is only remembered once it is complete.
+        if module is None or not _initializing(module):
+            _resolved[module_name] = module
+
+    if module is not None:
         module.loader.load(prefer_system=prefer_system)
-        del module
+    del module
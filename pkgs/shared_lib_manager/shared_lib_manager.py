@@ -5,15 +5,73 @@
 
 from __future__ import annotations
 
-import ctypes
+import functools
 import os
 import platform
+import threading
 from pathlib import Path
 from typing import TYPE_CHECKING, Callable
 
 if TYPE_CHECKING:
+    import ctypes
     from collections.abc import Iterable
 
+    _PathArg = os.PathLike | str | None
+
+# The platform cannot change during the lifetime of the process, so it is only queried
+# once rather than on every loader construction.
+_SYSTEM = platform.system()
+
+# Position of the current platform's entry in a (Linux, Darwin, Windows) tuple.
+_PLATFORM_INDEX = {"Linux": 0, "Darwin": 1, "Windows": 2}.get(_SYSTEM)
+
+# Values of the PREFER_<LIBRARY>_SYSTEM_LIBRARY environment variables that enable
+# loading the system library.
+_TRUTHY_VALUES = frozenset({"true", "1", "yes", "on"})
+
+# Handles to every library loaded by any loader in the process, keyed by the name or
+# path passed to the dynamic loader. Different packages may declare the same underlying
+# library, which only needs to be loaded once. The first load of a library therefore
+# determines its mode for the whole process, which matches the dynamic loader: opening
+# an already loaded library again returns the existing handle without binding its
+# symbols again. Holding on to the handles also guarantees that the libraries are never
+# unloaded.
+_HANDLES: dict[str, ctypes.CDLL] = {}
+_HANDLES_LOCK = threading.Lock()
+
+# Library names that could not be loaded from the system search path. A failed search
+# will not succeed on a later attempt in the same process, so it is not repeated.
+_SYSTEM_MISSES: set[str] = set()
+
+
+@functools.lru_cache(maxsize=32)
+def _is_truthy(value: str) -> bool:
+    """Return whether an environment variable value enables an option."""
+    return value.lower() in _TRUTHY_VALUES
+
+
+def _prefault(paths: Iterable[str]) -> None:
+    """Ask the kernel to start reading library files into the page cache.
+
+    Loading a library whose file is not yet cached blocks on synchronous page reads.
+    Issuing the reads for a batch of libraries up front lets them proceed while the
+    earlier libraries in the batch are loaded. This is purely advisory, so any failure
+    is ignored, and it is a no-op on platforms without posix_fadvise.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
 
 # Once we require Python 3.10, switch to using a dataclass with kw_only=True
 class PlatformLibrary:
@@ -76,39 +134,91 @@ class LibraryLoader:
     libraries : dict[str, PlatformLibrary | tuple[os.PathLike | str, os.PathLike | str, os.PathLike | str]]
         A mapping from library names to the paths of the libraries on each platform. If
         a tuple is passed, it must be ordered as (Linux, Darwin, Windows).
+    lazy : bool
+        Whether to defer resolution of function symbols until they are first called
+        (RTLD_LAZY) instead of resolving all of them when the library is loaded. This
+        makes loading libraries with many undefined symbols faster at the cost of
+        reporting missing symbols only when they are used. Has no effect on Windows,
+        or on libraries that were already loaded in the process, which keep the mode
+        that they were first loaded with. Default is False.
 
     """  # noqa: E501
 
+    __slots__ = (
+        "_basenames",
+        "_dlopen_mode",
+        "_env_keys",
+        "_libraries",
+        "_loaded",
+        "_paths",
+    )
+
     def __init__(
         self,
-        libraries: dict[str, PlatformLibrary],
+        libraries: dict[str, PlatformLibrary | tuple[_PathArg, _PathArg, _PathArg]],
+        *,
+        lazy: bool = False,
     ):
-        platform_name = platform.system()
-
         self._libraries = {}
         for lib, path in libraries.items():
-            if not isinstance(path, PlatformLibrary):
+            if isinstance(path, PlatformLibrary):
+                library_path = getattr(path, _SYSTEM, None)
+                if library_path is None and path.default is not None:
+                    library_path = Path(path.default())
+            elif isinstance(path, tuple):
+                if len(path) != 3:  # noqa: PLR2004
+                    raise ValueError(
+                        f"Invalid paths {path} for library {lib}. Expected a 3-tuple "
+                        "(Linux, Darwin, Windows)."
+                    )
+                # Only the current platform's entry is used, so there is no need to
+                # construct a full PlatformLibrary.
+                entry = None if _PLATFORM_INDEX is None else path[_PLATFORM_INDEX]
+                library_path = Path(entry) if entry else None
+                if library_path is not None and not library_path.is_absolute():
+                    raise ValueError("All paths must be absolute.")
+            else:
                 raise TypeError(
                     f"Invalid path {path} for library {lib}. Expected a tuple or "
                     "PlatformLibrary."
                 )
 
-            try:
-                self._libraries[lib] = getattr(path, platform_name)
-            except AttributeError:
-                if path.default is not None:
-                    self._libraries[lib] = Path(path.default())
-                else:
-                    raise ValueError(
-                        f"No library {lib} found for the current platform "
-                        f"{platform_name}. This is a bug in the wheel, please report "
-                        "to the maintainer."
-                    ) from None
+            if library_path is None:
+                raise ValueError(
+                    f"No library {lib} found for the current platform "
+                    f"{_SYSTEM}. This is a bug in the wheel, please report "
+                    "to the maintainer."
+                )
+            self._libraries[lib] = library_path
 
-    @staticmethod
-    def _load(library_path: Path | str) -> None:
+        # Store the string forms passed to the dynamic loader up front so that loading
+        # does not need to go through pathlib.
+        self._paths = {lib: str(path) for lib, path in self._libraries.items()}
+        self._basenames = {lib: path.name for lib, path in self._libraries.items()}
+        self._env_keys = {
+            lib: f"PREFER_{lib.upper()}_SYSTEM_LIBRARY" for lib in self._libraries
+        }
+        # Libraries that this loader has already loaded. A library stays loaded for the
+        # lifetime of the process, so subsequent loads can be skipped.
+        self._loaded: set[str] = set()
+        # Equal to ctypes.RTLD_LOCAL, which is zero on platforms without dlopen.
+        self._dlopen_mode = getattr(os, "RTLD_LOCAL", 0)
+        if lazy:
+            self._dlopen_mode |= getattr(os, "RTLD_LAZY", 0)
+
+    def _load(self, library_path: str) -> None:
         """Load the library at the given path with RTLD_LOCAL."""
-        ctypes.CDLL(str(library_path), mode=ctypes.RTLD_LOCAL)
+        if library_path in _HANDLES:
+            return
+        with _HANDLES_LOCK:
+            if library_path not in _HANDLES:
+                # ctypes is comparatively expensive to import, so defer it until a
+                # library actually needs to be loaded.
+                import ctypes
+
+                _HANDLES[library_path] = ctypes.CDLL(
+                    library_path, mode=self._dlopen_mode
+                )
 
     def load(
         self, libraries: Iterable[str] | None = None, *, prefer_system: bool = False
@@ -121,27 +231,59 @@ class LibraryLoader:
             The names of the libraries to load. If None, all libraries are loaded.
         prefer_system : bool
             Whether or not to try loading a system library before the local version.
-            Default is False.
+            Default is False. This may also be enabled for an individual library by
+            setting the environment variable ``PREFER_<LIBRARY>_SYSTEM_LIBRARY`` to
+            one of "true", "1", "yes", or "on", in any case. Any other value,
+            including "0" and an empty string, leaves it disabled.
 
         """
         # Always load the library in local mode.
 
         if libraries is None:
-            libraries = self._libraries.keys()
+            libraries = self._libraries
 
+        # Bind everything used in the loops to locals once.
+        paths = self._paths
+        basenames = self._basenames
+        env_keys = self._env_keys
+        loaded = self._loaded
+        load = self._load
+        getenv = os.environ.get
+
+        # Determine up front what will be loaded and from where so that the files of
+        # the bundled libraries can be prefetched as a batch.
+        pending = []
         for library_name in libraries:
             try:
-                library_path = self._libraries[library_name]
+                library_path = paths[library_name]
             except KeyError:
                 raise ValueError(
                     f"Library {library_name} not found in the package."
                 ) from None
-            if prefer_system or os.getenv(
-                f"PREFER_{library_name.upper()}_SYSTEM_LIBRARY", "false"
-            ).lower() not in ("false", 0):
+            if library_name in loaded:
+                continue
+            basename = basenames[library_name]
+            try_system = basename not in _SYSTEM_MISSES and (
+                prefer_system or _is_truthy(getenv(env_keys[library_name], ""))
+            )
+            pending.append((library_name, library_path, basename, try_system))
+
+        # A single library would be read immediately anyway, so there is nothing to
+        # overlap with.
+        if len(pending) > 1:
+            _prefault(
+                library_path
+                for _, library_path, _, try_system in pending
+                if not try_system and library_path not in _HANDLES
+            )
+
+        for library_name, library_path, basename, try_system in pending:
+            if try_system:
                 try:
-                    self._load(library_path.name)
+                    load(basename)
                 except OSError:
-                    self._load(library_path)
+                    _SYSTEM_MISSES.add(basename)
+                    load(library_path)
             else:
-                self._load(library_path)
+                load(library_path)
+            loaded.add(library_name)
@@ -3,14 +3,17 @@
 
 """Common test helpers."""
 
+from __future__ import annotations
+
+import hashlib
+import os
+import re
 import shutil
 import subprocess
 import tempfile
 from pathlib import Path
 
 import pytest
-import tomlkit
-from packaging.version import parse as parse_version
 
 DIR = Path(__file__).parent
 ROOT_DIR = DIR.parent.parent
@@ -26,6 +29,14 @@ COMMON_PIP_ARGS = (
 
 ENV_ROOT = DIR / "generated"
 
+# Files excluded when copying a package's sources.
+IGNORE_PATTERNS = shutil.ignore_patterns(
+    "tests*", "build*", "dist*", "*.egg-info*", ".git"
+)
+
+# The project version in a pyproject.toml, with the major version as its own group.
+VERSION_PATTERN = re.compile(r'^(version\s*=\s*")(\d+)(\.[^"]*")', re.MULTILINE)
+
 
 def pytest_addoption(parser: pytest.Parser) -> None:
     """Set up the option for saving output files."""
@@ -42,10 +53,34 @@ def pytest_configure(config: pytest.Config) -> None:
         config.add_cleanup(lambda: shutil.rmtree(ENV_ROOT))
 
 
+def worker_dir(name: str) -> Path:
+    """Get a directory in ENV_ROOT that belongs to the current session.
+
+    Every pytest-xdist worker runs its own session, so anything created by session-level
+    setup needs a separate directory per worker to avoid the workers overwriting each
+    other's files.
+    """
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    return ENV_ROOT / (f"{name}_{worker}" if worker else name)
+
+
 @pytest.fixture(scope="session")
 def package_wheelhouse() -> Path:
     """Produce the wheelhouse where the built packages go."""
-    return ENV_ROOT / "package_wheelhouse"
+    return worker_dir("package_wheelhouse")
+
+
+def link_or_copy(src: str, dst: str) -> str:
+    """Hard link a file, falling back to a copy where linking is not possible.
+
+    Files copied this way may share their contents with the source, so they must be
+    replaced rather than modified in place.
+    """
+    try:
+        os.link(src, dst)
+    except OSError:
+        return shutil.copy2(src, dst)
+    return dst
 
 
 def create_patched_library(
@@ -61,36 +96,39 @@ def create_patched_library(
     shutil.copytree(
         pkg_source_dir,
         tmp_package_dir,
-        ignore=shutil.ignore_patterns(
-            "tests*", "build*", "dist*", "*.egg-info*", ".git"
-        ),
+        ignore=IGNORE_PATTERNS,
+        copy_function=link_or_copy,
         dirs_exist_ok=True,
     )
 
+    # Only the version needs to change, so a targeted substitution suffices and avoids
+    # a full TOML round trip.
     pyproject_file = tmp_package_dir / "pyproject.toml"
-    with Path(pyproject_file).open() as f:
-        pyproject = tomlkit.load(f)
-    project_data = pyproject["project"]
-
-    version = parse_version(project_data["version"])
-    project_data["version"] = f"{version.major + 1}.{version.minor}.{version.micro}"
-    with Path(pyproject_file).open("w") as f:
-        tomlkit.dump(pyproject, f)
+    pyproject, count = VERSION_PATTERN.subn(
+        lambda m: f"{m[1]}{int(m[2]) + 1}{m[3]}", pyproject_file.read_text(), count=1
+    )
+    if count == 0:
+        raise ValueError(f"No version found to increment in {pyproject_file}.")
+    pyproject_file.unlink()
+    pyproject_file.write_text(pyproject)
 
     return tmp_package_dir
 
 
 def make_wheel(
-    package_wheelhouse: Path, package_dir: Path
+    package_wheelhouse: Path, *package_dirs: Path
 ) -> subprocess.CompletedProcess:
-    """Build a wheel for the package.
+    """Build wheels for the packages.
+
+    All packages are built by a single pip invocation so that the cost of starting
+    the interpreter and importing pip is only paid once.
 
     Parameters
     ----------
     package_wheelhouse : Path
-        The directory where the wheel should be stored.
-    package_dir : Path
-        The directory of the package to be built.
+        The directory where the wheels should be stored.
+    *package_dirs : Path
+        The directories of the packages to be built.
 
     Returns
     -------
@@ -106,36 +144,85 @@ def make_wheel(
             "--no-deps",
             "--wheel-dir",
             package_wheelhouse,
-            package_dir,
+            *package_dirs,
         ],
         check=False,
     )
 
 
-@pytest.fixture(scope="session", autouse=True)
-def shared_lib_manager_wheel(
-    tmp_path_factory: pytest.TempPathFactory, package_wheelhouse: Path
-) -> subprocess.CompletedProcess:
-    """Produce a wheel for the shared_lib_manager."""
+@pytest.fixture(scope="session")
+def shared_lib_manager_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Produce the patched sources of the shared_lib_manager."""
     tmp_package_dir = create_patched_library(tmp_path_factory, MANAGER_DIR)
 
     # Add the monkeypatching to the library.
     # TODO: Also just add the file directly in tests so it's not in the source.
     loader_init_file = tmp_package_dir / "shared_lib_manager.py"
-    with Path(loader_init_file).open("a") as f, Path(
-        DIR / "monkeypatch.py"
-    ).open() as mp:
-        f.write(mp.read())
-    return make_wheel(package_wheelhouse, tmp_package_dir)
+    loader_source = loader_init_file.read_text()
+    loader_init_file.unlink()
+    loader_init_file.write_text(loader_source + (DIR / "monkeypatch.py").read_text())
+    return tmp_package_dir
+
+
+@pytest.fixture(scope="session")
+def shared_lib_consumer_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Produce the patched sources of the shared_lib_consumer."""
+    return create_patched_library(tmp_path_factory, CONSUMER_DIR)
+
+
+def source_digest(*paths: Path) -> str:
+    """Compute a digest identifying the current state of a set of source files.
+
+    Directories are walked recursively, skipping the same files that are excluded when
+    the sources are copied. Only the names, sizes and modification times of the files
+    are hashed, which suffices to detect edits without reading the contents.
+    """
+    hasher = hashlib.blake2b(digest_size=20)
+    for path in paths:
+        if path.is_file():
+            files = [str(path)]
+        else:
+            files = []
+            for dirpath, dirnames, filenames in os.walk(path):
+                ignored = IGNORE_PATTERNS(dirpath, [*dirnames, *filenames])
+                dirnames[:] = sorted(d for d in dirnames if d not in ignored)
+                files.extend(
+                    os.path.join(dirpath, f)  # noqa: PTH118
+                    for f in sorted(filenames)
+                    if f not in ignored
+                )
+        for file in files:
+            stat = os.stat(file)  # noqa: PTH116
+            hasher.update(f"{file}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return hasher.hexdigest()
 
 
 @pytest.fixture(scope="session", autouse=True)
-def shared_lib_consumer_wheel(
-    tmp_path_factory: pytest.TempPathFactory, package_wheelhouse: Path
-) -> subprocess.CompletedProcess:
-    """Produce a wheel for the shared_lib_manager."""
-    tmp_package_dir = create_patched_library(tmp_path_factory, CONSUMER_DIR)
-    return make_wheel(package_wheelhouse, tmp_package_dir)
+def shared_lib_wheels(
+    request: pytest.FixtureRequest, package_wheelhouse: Path
+) -> subprocess.CompletedProcess | None:
+    """Produce the wheels for the shared_lib_manager and shared_lib_consumer.
+
+    When the wheelhouse is kept between sessions, the wheels are only rebuilt if the
+    sources that they are built from have changed.
+    """
+    digest = source_digest(
+        MANAGER_DIR, CONSUMER_DIR, DIR / "monkeypatch.py", DIR / "conftest.py"
+    )
+    stamp = package_wheelhouse / ".source_digest"
+    if stamp.is_file() and stamp.read_text() == digest:
+        return None
+
+    # The patched sources are only requested here so that they are not prepared at all
+    # when the existing wheels are reused.
+    result = make_wheel(
+        package_wheelhouse,
+        request.getfixturevalue("shared_lib_manager_dir"),
+        request.getfixturevalue("shared_lib_consumer_dir"),
+    )
+    if result.returncode == 0:
+        stamp.write_text(digest)
+    return result
 
 
 @pytest.fixture(scope="session", params=("LOCAL", "GLOBAL"))
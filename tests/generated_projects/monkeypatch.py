@@ -10,7 +10,6 @@ to enable testing of those approaches without exposing them via the public API.
 
 import ctypes
 import os
-import platform
 from collections.abc import Iterable
 from enum import Enum, auto
 from pathlib import Path
@@ -29,6 +28,18 @@ class LoadMode(Enum):
     ENV = auto()
 
 
+# Environment variable settings used by LoadMode.ENV, resolved once from the platform
+# detected by the loader module.
+_ENV_VAR = (
+    "LD_LIBRARY_PATH"
+    if _SYSTEM == "Linux"  # type: ignore[name-defined] # noqa: F821
+    else "DYLD_LIBRARY_PATH"
+    if _SYSTEM == "Darwin"  # type: ignore[name-defined] # noqa: F821
+    else "PATH"
+)
+_PATH_SEP = ";" if _SYSTEM == "Windows" else ":"  # type: ignore[name-defined] # noqa: F821
+
+
 # Create an alias so we don't lose the original reference after the override.
 LibraryLoaderOriginal = LibraryLoader  # type: ignore[misc, used-before-def] # noqa: F821
 
@@ -40,14 +51,28 @@ class TestingLibraryLoader(LibraryLoaderOriginal):
     neither of which is intended for general use due to their various flaws.
     """
 
+    __slots__ = ("_env_paths", "_load", "_mode")
+
     def __init__(
         self,
         libraries: dict[str, PlatformLibrary],  # type: ignore[name-defined] # noqa: F821
         *,
         mode: LoadMode = LoadMode.GLOBAL,
+        lazy: bool = False,
     ):
-        super().__init__(libraries)
+        super().__init__(libraries, lazy=lazy)
         self._mode = mode
+        # _load is a slot on this class, so it must always be bound explicitly.
+        if mode == LoadMode.GLOBAL:
+            self._load = self._load_global  # type: ignore[method-assign]
+        else:
+            self._load = super()._load  # type: ignore[method-assign]
+        if mode == LoadMode.ENV:
+            # The library paths are fixed, so the search path entries only need to be
+            # assembled once.
+            self._env_paths = _PATH_SEP.join(
+                str(path.parent) for path in self._libraries.values()
+            )
 
     @staticmethod
     def _load_global(library_path: Path | str) -> None:  # type: ignore[syntax]
@@ -71,30 +96,18 @@ class TestingLibraryLoader(LibraryLoaderOriginal):
 
         """
         if self._mode == LoadMode.ENV:
-            # Set up env and return.
-            env_var = (
-                "LD_LIBRARY_PATH"
-                if platform.system() == "Linux"
-                else "DYLD_LIBRARY_PATH"
-                if platform.system() == "Darwin"
-                else "PATH"
-            )
-            sep = ";" if platform.system() == "Windows" else ":"
-            if base := os.getenv(env_var, ""):
-                base += sep
-            os.environ[env_var] = base + sep.join(
-                str(path.parent) for path in self._libraries.values()
-            )
+            # Set up env and return. Skip the update if a previous load already added
+            # these entries so that repeated loads neither grow the variable nor call
+            # putenv again.
+            base = os.getenv(_ENV_VAR, "")
+            if not base:
+                os.environ[_ENV_VAR] = self._env_paths
+            elif base != self._env_paths and not base.endswith(
+                _PATH_SEP + self._env_paths
+            ):
+                os.environ[_ENV_VAR] = base + _PATH_SEP + self._env_paths
         else:
-            if self._mode == LoadMode.GLOBAL:
-                self._load = self._load_global  # type: ignore[method-assign]
-            try:
-                super().load(libraries, prefer_system=prefer_system)
-            finally:
-                # Note that the order of the comments here is important because ruff
-                # recognizes the noqa after the type comment while mypy does not detect
-                # the reverse.
-                self._load = LibraryLoaderOriginal._load  # type: ignore[method-assign] # noqa: SLF001
+            super().load(libraries, prefer_system=prefer_system)
 
 
 LibraryLoader = TestingLibraryLoader  # type: ignore[misc]
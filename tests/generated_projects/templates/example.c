@@ -3,8 +3,15 @@
 
 #include "{{ prefix }}example.h"
 
+{% if undefined_symbol %}
+// Deliberately never defined so that the library can only be loaded lazily.
+int {{ prefix }}undefined(int x);
+
+{% endif %}
 int {{ prefix }}square(int x) {
-  {% if square_as_cube %}
+  {% if undefined_symbol %}
+    return {{ prefix }}undefined(x);
+  {% elif square_as_cube %}
     return x * x * x;
   {% else %}
     return x * x;
@@ -4,19 +4,30 @@
 import shared_lib_manager
 import os
 
-root = os.path.dirname(os.path.abspath(__file__))
+lib_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lib")
 loader = shared_lib_manager.LibraryLoader(
     {
 # Write a jinja for loop over library_names
 {% for library_name in library_names %}
+{% if platform_tuples %}
+        "{{ library_name }}": (
+            os.path.join(lib_dir, "lib{{ library_name }}.so"),
+            os.path.join(lib_dir, "lib{{ library_name }}.dylib"),
+            os.path.join(lib_dir, "{{ library_name }}.dll"),
+        ),
+{% else %}
         "{{ library_name }}": shared_lib_manager.PlatformLibrary(
-            Linux=os.path.join(root, "lib", "lib{{ library_name }}.so"),
-            Darwin=os.path.join(root, "lib", "lib{{ library_name }}.dylib"),
-            Windows=os.path.join(root, "lib", "{{ library_name }}.dll"),
+            Linux=os.path.join(lib_dir, "lib{{ library_name }}.so"),
+            Darwin=os.path.join(lib_dir, "lib{{ library_name }}.dylib"),
+            Windows=os.path.join(lib_dir, "{{ library_name }}.dll"),
         ),
+{% endif %}
 {% endfor %}
     },
     mode=shared_lib_manager.LoadMode.{{ load_mode }},
+{% if lazy %}
+    lazy=True,
+{% endif %}
 )
 
 __all__ = [
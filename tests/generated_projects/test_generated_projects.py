@@ -6,28 +6,205 @@
 from __future__ import annotations
 
 import contextlib
+import functools
 import hashlib
 import json
+import os
 import platform
+import re
+import shutil
 import subprocess
 import sys
 import tempfile
 import textwrap
 import venv
-from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import pytest
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
     from os import PathLike
 
-from conftest import DIR, ENV_ROOT
+from conftest import DIR, ENV_ROOT, IGNORE_PATTERNS, link_or_copy, worker_dir
 
 sys.path.insert(0, str(DIR))
 
+# The name and version of a generated project in its pyproject.toml.
+PROJECT_NAME_PATTERN = re.compile(r'^name\s*=\s*"([^"]+)"', re.MULTILINE)
+PROJECT_VERSION_PATTERN = re.compile(r'^version\s*=\s*"([^"]+)"', re.MULTILINE)
+
+# Everything needed to build the generated C++ packages, whose only declared build
+# requirement is scikit-build-core. The pyproject extra, CMake and Ninja are normally
+# requested on demand by scikit-build-core in an isolated build.
+CPP_BUILD_REQUIREMENTS = ("scikit-build-core[pyproject]", "cmake", "ninja")
+
+
+def venv_executable(env_dir: Path) -> Path:
+    """Get the path to the interpreter of a virtual environment."""
+    if platform.system() != "Windows":
+        return env_dir / "bin" / "python"
+    return env_dir / "Scripts" / "python.exe"
+
+
+def pip_environment() -> dict[str, str]:
+    """Get the environment variables for running pip in a test environment.
+
+    The settings are passed through the environment instead of on the command line so
+    that they also apply to the pip processes that populate isolated build environments.
+    Sharing the pip cache between environments means that build dependencies are only
+    downloaded once per session. Wheels built from local directories are never cached
+    by pip, so the generated packages cannot leak between tests.
+    """
+    return {
+        **os.environ,
+        "PIP_DISABLE_PIP_VERSION_CHECK": "1",
+        "PIP_NO_INPUT": "1",
+        "PIP_CACHE_DIR": str(ENV_ROOT / "pip_cache"),
+    }
+
+
+@functools.cache
+def prototype_env_dir() -> Path:
+    """Create the virtual environment that every test environment is copied from.
+
+    Creating an environment and upgrading pip in it takes several seconds, so it is only
+    done once per session. Environments do not refer to their own location anywhere
+    that matters when pip is run as a module, so copies work without any fixups.
+    """
+    env_dir = worker_dir("prototype_env")
+    executable = venv_executable(env_dir)
+    if not executable.exists():
+        venv.create(
+            env_dir,
+            clear=True,
+            symlinks=platform.system() != "Windows",
+            with_pip=True,
+        )
+        # Always update pip to ensure that we have the necessary new features like
+        # config-settings. The build requirements of the generated C++ packages are
+        # installed once here so that those packages can be built without isolation.
+        subprocess.run(
+            [
+                executable,
+                "-I",
+                "-m",
+                "pip",
+                "install",
+                "-U",
+                "pip",
+                *CPP_BUILD_REQUIREMENTS,
+            ],
+            env=pip_environment(),
+            check=True,
+        )
+    return env_dir
+
+
+def source_files(package_dir: Path) -> Iterator[str]:
+    """Iterate over the source files of a generated package in a stable order.
+
+    The build and install trees, which are written while the package is built, are
+    skipped.
+    """
+    for dirpath, dirnames, filenames in os.walk(package_dir):
+        ignored = IGNORE_PATTERNS(dirpath, dirnames)
+        dirnames[:] = sorted(d for d in dirnames if d not in ignored and d != "install")
+        for filename in sorted(filenames):
+            yield os.path.join(dirpath, filename)  # noqa: PTH118
+
+
+def current_wheel(package_dir: Path, wheelhouse: Path) -> Path | None:
+    """Find a wheel for a package that was built after its sources last changed.
+
+    Parameters
+    ----------
+    package_dir : Path
+        The directory containing the package.
+    wheelhouse : Path
+        The directory that the package's wheel would have been built into.
+
+    Returns
+    -------
+    Path | None
+        The wheel, or None if there is no wheel or it is older than any of the sources.
+
+    """
+    pyproject = (package_dir / "pyproject.toml").read_text()
+    name = PROJECT_NAME_PATTERN.search(pyproject)
+    version = PROJECT_VERSION_PATTERN.search(pyproject)
+    if name is None or version is None:
+        return None
+    wheels = sorted(wheelhouse.glob(f"{name[1].replace('-', '_')}-{version[1]}-*.whl"))
+    if not wheels:
+        return None
+    wheel = wheels[-1]
+    built = wheel.stat().st_mtime_ns
+    if any(
+        os.stat(path).st_mtime_ns > built  # noqa: PTH116
+        for path in source_files(package_dir)
+    ):
+        return None
+    return wheel
+
+
+@functools.cache
+def build_toolchain() -> tuple[str, ...]:
+    """Get the distributions preinstalled in the prototype environment.
+
+    The names of the distributions' metadata directories include their versions, so
+    they identify the build toolchain that wheels built without isolation depend on.
+    """
+    env_dir = prototype_env_dir()
+    if platform.system() == "Windows":
+        site_packages = env_dir / "Lib" / "site-packages"
+    else:
+        site_packages = (
+            env_dir
+            / "lib"
+            / f"python{sys.version_info.major}.{sys.version_info.minor}"
+            / "site-packages"
+        )
+    return tuple(sorted(path.name for path in site_packages.glob("*.dist-info")))
+
+
+def package_digest(package_dir: Path, *args: str) -> str:
+    """Compute a digest of everything that determines the wheel built for a package.
+
+    Parameters
+    ----------
+    package_dir : Path
+        The directory containing the package.
+    *args
+        The extra arguments that the wheel is built with.
+
+    Returns
+    -------
+    str
+        The digest of the package's sources, the build arguments, the build toolchain
+        and the platform.
+
+    """
+    hasher = hashlib.blake2b(digest_size=20)
+    hasher.update(
+        "\0".join(
+            (
+                sys.implementation.cache_tag,
+                platform.system(),
+                platform.machine(),
+                *build_toolchain(),
+                *args,
+            )
+        ).encode()
+    )
+    for path in source_files(package_dir):
+        hasher.update(f"\0{os.path.relpath(path, package_dir)}\0".encode())
+        hasher.update(Path(path).read_bytes())
+    return hasher.hexdigest()
+
 
 class VEnv:
     """Convenience class for managing a virtual environment for testing.
@@ -41,104 +218,204 @@ class VEnv:
 
     def __init__(self, root: Path, package_wheelhouse: Path):
         self.env_dir = root / "env"
-        Path(self.env_dir).mkdir(exist_ok=True)
+        self.env_dir.mkdir(exist_ok=True)
 
-        self.nll_wheelhouse = str(package_wheelhouse)
-        self.wheelhouse = str(root / "wheelhouse")
-        self.cache_dir = str(root / "cache")
+        self.nll_wheelhouse = package_wheelhouse
+        self.wheelhouse = root / "wheelhouse"
 
-        self.executable = (
-            str(Path(self.env_dir) / "bin" / "python")
-            if platform.system() != "Windows"
-            else str(Path(self.env_dir) / "Scripts" / "python.exe")
-        )
+        self.executable = venv_executable(self.env_dir)
         # Allow for rerunning the script on preexisting test directories for local
         # debugging and interactive exploration.
-        if not Path(self.executable).exists():
-            venv.create(
+        if not self.executable.exists():
+            # Files are only ever added to or removed from environments, never modified
+            # in place, so the copy can share its files with the prototype.
+            shutil.copytree(
+                prototype_env_dir(),
                 self.env_dir,
-                clear=True,
-                with_pip=True,
+                symlinks=True,
+                copy_function=link_or_copy,
+                dirs_exist_ok=True,
             )
 
-        self._pip_cmd_base: list[str] = [
+        # Isolated mode skips the interpreter's user site and PYTHON* variables.
+        self._pip_cmd_base: tuple[Path | str, ...] = (
             self.executable,
+            "-I",
             "-m",
             "pip",
-            "--disable-pip-version-check",
-            "--cache-dir",
-            self.cache_dir,
-        ]
-        # Always update pip to ensure that we have the necessary new features like
-        # config-settings.
-        self.install("pip", "-U")
+        )
+        self._pip_env = pip_environment()
 
     def install(
-        self, package_name: Path | str, *args: str, editable: bool = False
+        self,
+        package_name: Path | str | Sequence[Path | str],
+        *args: str,
+        editable: bool = False,
     ) -> subprocess.CompletedProcess:
-        """Install a package into the virtual environment with `pip install`.
+        """Install packages into the virtual environment with `pip install`.
 
         Parameters
         ----------
-        package_name : str
-            The name of the package to install.
+        package_name : PathLike or str or Sequence[PathLike or str]
+            The name of the package to install, or several names to install them with
+            a single pip invocation.
         *args
             Arguments to pass to `pip install`.
         editable : bool, optional
-            Whether to install the package in editable mode.
+            Whether to install the packages in editable mode.
 
         """
-        pkg_args = [package_name]
-        if editable:
-            pkg_args.insert(0, "-e")
+        package_names = (
+            [package_name] if isinstance(package_name, (Path, str)) else package_name
+        )
+        pkg_args = [
+            arg
+            for name in package_names
+            for arg in (("-e", name) if editable else (name,))
+        ]
 
         return subprocess.run(
             [
                 *self._pip_cmd_base,
-                *(
-                    "install",
-                    "--find-links",
-                    self.nll_wheelhouse,
-                    "--find-links",
-                    self.wheelhouse,
-                    *args,
-                ),
+                "install",
+                "--find-links",
+                self.nll_wheelhouse,
+                "--find-links",
+                self.wheelhouse,
+                # Each environment imports the installed packages once or twice, so
+                # compiling all of their modules up front is not worth it.
+                "--no-compile",
+                *args,
                 *pkg_args,
             ],
+            env=self._pip_env,
             check=True,
         )
 
     def wheel(
-        self, package_dir: PathLike | str, *args: str
-    ) -> subprocess.CompletedProcess:
+        self, package_dir: PathLike | str, *args: str, build_isolation: bool = True
+    ) -> subprocess.CompletedProcess | None:
         """Build a wheel with `pip wheel`.
 
+        Nothing is built if the wheelhouse already contains a wheel for the package that
+        is newer than all of its sources and was built with the same arguments, which
+        happens when a kept test directory is run again. Wheels built without isolation
+        depend only on the package's sources and the environment's preinstalled build
+        requirements, so they are also shared between tests through a cache keyed by
+        the contents of the package.
+
         Parameters
         ----------
         package_dir : PathLike or str
             The directory containing the package to build.
         *args
             Arguments to pass to `pip install`.
+        build_isolation : bool, optional
+            Whether to build the package in an isolated environment. Packages whose
+            build requirements are all preinstalled in the environment can be built
+            without isolation to skip installing the requirements for every build.
+
+        Returns
+        -------
+        subprocess.CompletedProcess | None
+            The result of the build, or None if the existing wheel was reused.
 
         """
-        return subprocess.run(
+        package_dir = Path(package_dir)
+        # The arguments of the last build are recorded next to its wheel, since they
+        # also determine its contents.
+        build_args = json.dumps([build_isolation, *args])
+        build_args_file = self.wheelhouse / f".{package_dir.name}.build_args"
+        if (
+            current_wheel(package_dir, self.wheelhouse) is not None
+            and build_args_file.is_file()
+            and build_args_file.read_text() == build_args
+        ):
+            return None
+
+        if not build_isolation:
+            cache_dir = ENV_ROOT / "wheel_cache" / package_digest(package_dir, *args)
+            for cached_wheel in cache_dir.glob("*.whl"):
+                self.wheelhouse.mkdir(parents=True, exist_ok=True)
+                linked_wheel = self.wheelhouse / cached_wheel.name
+                if not (linked_wheel.exists() and linked_wheel.samefile(cached_wheel)):
+                    # Link under a temporary name and rename it over any wheel left by
+                    # an earlier session so that the wheel is replaced atomically.
+                    staging = linked_wheel.with_name(f".{linked_wheel.name}.tmp")
+                    staging.unlink(missing_ok=True)
+                    link_or_copy(str(cached_wheel), str(staging))
+                    staging.replace(linked_wheel)
+                # The linked wheel keeps the modification time of the cache entry, so
+                # mark it as built now for current_wheel to recognize it on later runs.
+                os.utime(linked_wheel)
+                build_args_file.write_text(build_args)
+                return None
+
+        result = subprocess.run(
             [
                 *self._pip_cmd_base,
-                *(
-                    "wheel",
-                    "--no-deps",
-                    "--wheel-dir",
-                    self.wheelhouse,
-                    "--find-links",
-                    self.nll_wheelhouse,
-                    "--find-links",
-                    self.wheelhouse,
-                    package_dir,
-                    *args,
-                ),
+                "wheel",
+                "--no-deps",
+                *(() if build_isolation else ("--no-build-isolation",)),
+                "--wheel-dir",
+                self.wheelhouse,
+                "--find-links",
+                self.nll_wheelhouse,
+                "--find-links",
+                self.wheelhouse,
+                package_dir,
+                *args,
             ],
+            env=self._pip_env,
             check=True,
         )
+        build_args_file.write_text(build_args)
+
+        if not build_isolation:
+            wheel = current_wheel(package_dir, self.wheelhouse)
+            if wheel is not None:
+                # Populate the cache entry under a temporary name and then rename it
+                # into place so that concurrent readers never see a partial entry.
+                cache_dir.parent.mkdir(parents=True, exist_ok=True)
+                staging_dir = Path(tempfile.mkdtemp(dir=cache_dir.parent))
+                link_or_copy(str(wheel), str(staging_dir / wheel.name))
+                try:
+                    staging_dir.rename(cache_dir)
+                except OSError:
+                    # Another build already populated the entry.
+                    shutil.rmtree(staging_dir)
+        return result
+
+    def wheel_parallel(
+        self,
+        package_dirs: Sequence[PathLike | str],
+        *args: str,
+        build_isolation: bool = True,
+    ) -> list[subprocess.CompletedProcess | None]:
+        """Build wheels for independent packages concurrently.
+
+        Each build is a separate `pip wheel` process, so threads suffice to run them in
+        parallel. The packages must not depend on each other's wheels at build time.
+
+        Parameters
+        ----------
+        package_dirs : Sequence[PathLike or str]
+            The directories containing the packages to build.
+        *args
+            Arguments to pass to each `pip wheel`.
+        build_isolation : bool, optional
+            Whether to build the packages in isolated environments.
+
+        """
+        with ThreadPoolExecutor(max_workers=len(package_dirs)) as pool:
+            return list(
+                pool.map(
+                    lambda package_dir: self.wheel(
+                        package_dir, *args, build_isolation=build_isolation
+                    ),
+                    package_dirs,
+                )
+            )
 
     def run(self, code: str) -> subprocess.CompletedProcess:
         """Run Python code in the virtual environment.
@@ -149,23 +426,14 @@ class VEnv:
             The Python code to run.
 
         """
-        # To support Windows (prior to 3.12 when the delete_on_close parameter
-        # exists) we have to manually delete the temporary file because when
-        # delete=True the file cannot be reopened without following special
-        # rules that we cannot control when simply executing it directly via
-        # Python in the subprocess (we could with a suitable os.open call, but
-        # that's not relevant here). See
-        # https://docs.python.org/3/library/tempfile.html#tempfile.NamedTemporaryFile
-        f = tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False)
-        f.write(textwrap.dedent(code))
-        f.flush()
-        f.close()
-        try:
-            return subprocess.run(
-                [self.executable, f.name], capture_output=True, check=True
-            )
-        finally:
-            Path(f.name).unlink()
+        # The snippets are small, so they are passed on the command line rather than
+        # through a temporary file. Isolated mode keeps the working directory, user site
+        # and PYTHON* variables from affecting what gets imported.
+        return subprocess.run(
+            [self.executable, "-I", "-c", textwrap.dedent(code)],
+            capture_output=True,
+            check=True,
+        )
 
 
 def dir_test(base_name: str, **kwargs: str) -> Path:
@@ -180,24 +448,35 @@ def dir_test(base_name: str, **kwargs: str) -> Path:
 
     """
     kwargs["test_name"] = base_name
-    hasher = hashlib.sha1()
-    hasher.update(json.dumps(kwargs, sort_keys=True).encode())
-    dirname = ENV_ROOT / hasher.hexdigest()
+    parameters = json.dumps(kwargs, sort_keys=True)
+    digest = hashlib.blake2b(parameters.encode(), digest_size=20).hexdigest()
+    dirname = ENV_ROOT / digest
     dirname.mkdir(parents=True, exist_ok=True)
-    with Path(dirname / "parameters.json").open(mode="w") as f:
-        json.dump(kwargs, f, sort_keys=True)
+    # The directory is named after the parameters, so an existing file already contains
+    # exactly these parameters.
+    parameters_file = dirname / "parameters.json"
+    if not parameters_file.exists():
+        parameters_file.write_text(parameters)
     return dirname
 
 
-@lru_cache
-def jinja_environment() -> Environment:
-    """Create a Jinja2 environment for rendering templates."""
-    template_dir = (DIR / "templates",)
-    return Environment(
-        loader=FileSystemLoader(template_dir),
-        trim_blocks=True,
-        lstrip_blocks=True,
-    )
+# Compiled templates are cached on disk (in the system temporary directory) so that
+# later sessions do not need to parse the templates again. The templates do not change
+# during a session, so they are never checked for modifications or evicted once loaded.
+JINJA_ENV = Environment(
+    loader=FileSystemLoader(DIR / "templates"),
+    bytecode_cache=FileSystemBytecodeCache(),
+    trim_blocks=True,
+    lstrip_blocks=True,
+    auto_reload=False,
+    cache_size=-1,
+)
+# Every template is loaded up front so that rendering never touches the file system.
+TEMPLATES = {
+    path.name: JINJA_ENV.get_template(path.name)
+    for path in (DIR / "templates").iterdir()
+    if path.is_file()
+}
 
 
 def generate_from_template(
@@ -217,12 +496,10 @@ def generate_from_template(
         Arguments to pass to the template.
 
     """
-    template = jinja_environment().get_template(template_name)
-
-    template_args = template_args or {}
-    content = template.render(**template_args)
+    # Stream the output straight to the file rather than rendering it to a string first.
+    # The file is opened in text mode so that newlines are translated as before.
     with Path(output_path).open(mode="w", encoding="utf-8") as f:
-        f.write(content)
+        f.writelines(TEMPLATES[template_name].generate(**(template_args or {})))
 
 
 def make_cpp_lib(
@@ -230,6 +507,7 @@ def make_cpp_lib(
     library_name: str,
     *,
     square_as_cube: bool = False,
+    undefined_symbol: bool = False,
     prefix: str = "",
 ) -> None:
     """Generate a standard C++ library with a CMake build system.
@@ -242,6 +520,9 @@ def make_cpp_lib(
         The name of the library.
     square_as_cube : bool, optional
         Whether to implement the square function as a cube function.
+    undefined_symbol : bool, optional
+        Whether to implement the square function by calling a function that is never
+        defined, which leaves an unresolved symbol in the library.
     prefix : str, optional
         A prefix to add to the function names.
 
@@ -250,9 +531,10 @@ def make_cpp_lib(
 
     lib_src_dir = root / library_name
     lib_cmake_dir = lib_src_dir / "cmake"
-    if lib_cmake_dir.exists():
+    try:
+        lib_cmake_dir.mkdir(parents=True)
+    except FileExistsError:
         return
-    lib_cmake_dir.mkdir(parents=True)
 
     generate_from_template(
         lib_src_dir / "CMakeLists.txt",
@@ -272,7 +554,11 @@ def make_cpp_lib(
     generate_from_template(
         lib_src_dir / "example.c",
         "example.c",
-        {"prefix": prefix, "square_as_cube": square_as_cube},
+        {
+            "prefix": prefix,
+            "square_as_cube": square_as_cube,
+            "undefined_symbol": undefined_symbol,
+        },
     )
     generate_from_template(
         lib_cmake_dir / "config.cmake.in",
@@ -281,13 +567,16 @@ def make_cpp_lib(
     )
 
 
-def make_cpp_pkg(
+def make_cpp_pkg(  # noqa: PLR0913
     root: PathLike | str,
     package_name: str,
     library_names: str | list[str],
     load_mode: str,
     *,
     square_as_cube: bool = False,
+    undefined_symbol: bool = False,
+    lazy: bool = False,
+    platform_tuples: bool = False,
 ) -> None:
     """Generate a Python package exporting a native library.
 
@@ -303,15 +592,23 @@ def make_cpp_pkg(
         The load mode used.
     square_as_cube : bool, optional
         Whether to implement the square function as a cube function.
+    undefined_symbol : bool, optional
+        Whether the libraries should contain a symbol that is never defined.
+    lazy : bool, optional
+        Whether the package's loader should resolve symbols lazily.
+    platform_tuples : bool, optional
+        Whether the package's loader should specify the library paths as tuples
+        instead of PlatformLibrary objects.
 
     """
     root = Path(root)
 
     lib_pkg_dir = root / package_name
     lib_dir = lib_pkg_dir / package_name
-    if lib_dir.exists():
+    try:
+        lib_dir.mkdir(parents=True)
+    except FileExistsError:
         return
-    lib_dir.mkdir(parents=True)
 
     if isinstance(library_names, str):
         library_names = [library_names]
@@ -337,7 +634,12 @@ def make_cpp_pkg(
     generate_from_template(
         lib_dir / "load.py",
         "load.py",
-        {"library_names": library_names, "load_mode": load_mode},
+        {
+            "library_names": library_names,
+            "load_mode": load_mode,
+            "lazy": lazy,
+            "platform_tuples": platform_tuples,
+        },
     )
 
     use_prefix = len(library_names) > 1
@@ -349,6 +651,7 @@ def make_cpp_pkg(
             lib_dir,
             library_name,
             square_as_cube=square_as_cube,
+            undefined_symbol=undefined_symbol,
             prefix=prefix,
         )
 
@@ -394,9 +697,10 @@ def make_python_pkg(  # noqa: PLR0913
 
     pylib_pkg_dir = root / package_name
     pylib_dir = pylib_pkg_dir / package_name
-    if pylib_dir.exists():
+    try:
+        pylib_dir.mkdir(parents=True)
+    except FileExistsError:
         return
-    pylib_dir.mkdir(parents=True)
 
     dependencies = dependencies or []
     build_dependencies = build_dependencies or []
@@ -467,6 +771,13 @@ def build_cmake_project(root: PathLike | str, *, install: bool = False) -> None:
     """
     root = Path(root)
 
+    # Ninja parallelizes builds by default and is faster than Make. It is not used on
+    # Windows, where the build below assumes a multi-config generator.
+    generator_args = (
+        ["-G", "Ninja"]
+        if platform.system() != "Windows" and shutil.which("ninja")
+        else []
+    )
     subprocess.run(
         [
             "cmake",
@@ -476,10 +787,17 @@ def build_cmake_project(root: PathLike | str, *, install: bool = False) -> None:
             root / "build",
             "--install-prefix",
             root / "install",
+            *generator_args,
         ],
         check=True,
     )
-    build_args = ["cmake", "--build", str(root / "build")]
+    build_args = [
+        "cmake",
+        "--build",
+        str(root / "build"),
+        "--parallel",
+        str(os.cpu_count() or 1),
+    ]
 
     # Handle multi-config generator on Windows (assuming we aren't using
     # multi-config Ninja on Linux).
@@ -572,7 +890,7 @@ def basic_test(
     )
 
     env = VEnv(root, package_wheelhouse)
-    env.wheel(root / cpp_package_name)
+    env.wheel(root / cpp_package_name, build_isolation=False)
     if python_editable:
         env.install(root / python_package_name, editable=python_editable)
     else:
@@ -639,7 +957,7 @@ def two_libraries_in_package_test(
     )
 
     env = VEnv(root, package_wheelhouse)
-    env.wheel(root / cpp_package_name)
+    env.wheel(root / cpp_package_name, build_isolation=False)
     if python_editable:
         env.install(root / python_package_name, editable=python_editable)
     else:
@@ -716,13 +1034,15 @@ def two_colliding_packages_test(
     )
 
     env = VEnv(root, package_wheelhouse)
-    env.wheel(root / foo_cpp_package_name)
-    env.wheel(root / foo_python_package_name)
-    env.install(foo_python_package_name, "--no-index")
-
-    env.wheel(root / bar_cpp_package_name)
-    env.wheel(root / bar_python_package_name)
-    env.install(bar_python_package_name, "--no-index")
+    # The foo and bar packages are independent, so each pair of builds can run
+    # concurrently. The Python packages need their C++ wheels in the wheelhouse, so
+    # those are built first.
+    env.wheel_parallel(
+        (root / foo_cpp_package_name, root / bar_cpp_package_name),
+        build_isolation=False,
+    )
+    env.wheel_parallel((root / foo_python_package_name, root / bar_python_package_name))
+    env.install((foo_python_package_name, bar_python_package_name), "--no-index")
 
     env.run(
         """
@@ -736,6 +1056,99 @@ def two_colliding_packages_test(
     )
 
 
+def loader_behavior_test(package_wheelhouse: Path, name: str, code: str) -> None:
+    """Check which libraries loaders open for the library of a generated package.
+
+    The code runs with ``ctypes.CDLL`` replaced by a wrapper that appends the name of
+    every library that is opened to ``opened``. ``make_loader()`` creates a new loader
+    for the package's library in LOCAL mode.
+
+    Parameters
+    ----------
+    package_wheelhouse : Path
+        The path to where the wheels to test are.
+    name : str
+        The name of the check, which determines its test directory.
+    code : str
+        The Python code of the check.
+
+    """
+    root = dir_test("loader_behavior", check=name)
+    library_name, cpp_package_name, _ = names("example")
+    make_cpp_pkg(root, cpp_package_name, library_name, "LOCAL")
+
+    env = VEnv(root, package_wheelhouse)
+    env.wheel(root / cpp_package_name, build_isolation=False)
+    env.install(cpp_package_name, "--no-index")
+    env.run(
+        textwrap.dedent(
+            f"""
+            import ctypes
+            from pathlib import Path
+
+            import shared_lib_manager
+            import {cpp_package_name}
+
+            lib_dir = Path({cpp_package_name}.__file__).parent / "lib"
+            paths = (
+                str(lib_dir / "lib{library_name}.so"),
+                str(lib_dir / "lib{library_name}.dylib"),
+                str(lib_dir / "{library_name}.dll"),
+            )
+
+            opened = []
+            CDLL = ctypes.CDLL
+
+            def recording_cdll(name, *args, **kwargs):
+                opened.append(name)
+                return CDLL(name, *args, **kwargs)
+
+            ctypes.CDLL = recording_cdll
+
+            def make_loader():
+                return shared_lib_manager.LibraryLoader(
+                    {{"{library_name}": paths}},
+                    mode=shared_lib_manager.LoadMode.LOCAL,
+                )
+            """
+        )
+        + textwrap.dedent(code),
+    )
+
+
+def lazy_loading_test(package_wheelhouse: Path, *, lazy: bool = False) -> None:
+    """Test loading a library that contains an undefined symbol.
+
+    Parameters
+    ----------
+    package_wheelhouse : Path
+        The path to where the wheels to test are.
+    lazy : bool
+        Whether the library should be loaded with lazy symbol resolution.
+
+    """
+    root = dir_test("lazy_loading", lazy=str(lazy))
+    library_name, cpp_package_name, _ = names("example")
+    make_cpp_pkg(
+        root,
+        cpp_package_name,
+        library_name,
+        "LOCAL",
+        undefined_symbol=True,
+        lazy=lazy,
+    )
+
+    env = VEnv(root, package_wheelhouse)
+    env.wheel(root / cpp_package_name, build_isolation=False)
+    env.install(cpp_package_name, "--no-index")
+    env.run(
+        f"""
+        import {cpp_package_name}
+        {cpp_package_name}.loader.load()
+        """,
+    )
+
+
 def test_basic(load_mode: str, package_wheelhouse: Path) -> None:
     """Test a single Python extension loading an associated library."""
     basic_test(package_wheelhouse, load_mode=load_mode)
@@ -859,6 +1272,205 @@ def test_env_vars(package_wheelhouse: Path) -> None:
         assert "ImportError: " in stderr
 
 
+def test_platform_tuples(package_wheelhouse: Path) -> None:
+    """Show that library paths may be given as (Linux, Darwin, Windows) tuples."""
+    root = dir_test("platform_tuples")
+    library_name, cpp_package_name, _ = names("example")
+    make_cpp_pkg(root, cpp_package_name, library_name, "LOCAL", platform_tuples=True)
+
+    env = VEnv(root, package_wheelhouse)
+    env.wheel(root / cpp_package_name, build_isolation=False)
+    env.install(cpp_package_name, "--no-index")
+    env.run(
+        f"""
+        import shared_lib_manager
+        import {cpp_package_name}
+        {cpp_package_name}.loader.load()
+
+        for paths, message in (
+            (("libfoo.so", "libfoo.dylib", "foo.dll"), "must be absolute"),
+            ((None, None, None), "No library foo found for the current platform"),
+            (("/libfoo.so", "/libfoo.dylib"), "Expected a 3-tuple"),
+        ):
+            try:
+                shared_lib_manager.LibraryLoader({{"foo": paths}})
+            except ValueError as e:
+                assert message in str(e), e
+            else:
+                raise AssertionError(f"No error for {{paths}}")
+        """,
+    )
+
+
+def test_prefer_system_library_env_var(package_wheelhouse: Path) -> None:
+    """Show which values of PREFER_<LIBRARY>_SYSTEM_LIBRARY enable the system library.
+
+    An attempt to load the system library is recorded either as a miss or, once the
+    bundled library is loaded and the dynamic loader matches the bare name against it,
+    as a handle under that name.
+    """
+    root = dir_test("prefer_system_library_env_var")
+    library_name, cpp_package_name, _ = names("example")
+    make_cpp_pkg(root, cpp_package_name, library_name, "LOCAL")
+
+    env = VEnv(root, package_wheelhouse)
+    env.wheel(root / cpp_package_name, build_isolation=False)
+    env.install(cpp_package_name, "--no-index")
+    env.run(
+        f"""
+        import os
+        import shared_lib_manager
+        import {cpp_package_name}
+
+        path = {cpp_package_name}.loader._libraries["{library_name}"]
+        for value, enabled in (
+            ("true", True),
+            ("1", True),
+            ("yes", True),
+            ("ON", True),
+            ("false", False),
+            ("0", False),
+            ("", False),
+            ("off", False),
+            ("enabled", False),
+        ):
+            shared_lib_manager._HANDLES.clear()
+            shared_lib_manager._SYSTEM_MISSES.clear()
+            os.environ["PREFER_{library_name.upper()}_SYSTEM_LIBRARY"] = value
+            shared_lib_manager.LibraryLoader(
+                {{"{library_name}": (path, path, path)}},
+                mode=shared_lib_manager.LoadMode.LOCAL,
+            ).load()
+            tried = (
+                path.name in shared_lib_manager._SYSTEM_MISSES
+                or path.name in shared_lib_manager._HANDLES
+            )
+            assert tried == enabled, f"{{value!r}} gave {{tried}}"
+        """,
+    )
+
+
+def test_load_library_module(package_wheelhouse: Path) -> None:
+    """Show how consumers load library modules that may or may not be installed."""
+    root = dir_test("load_library_module")
+    library_name, cpp_package_name, _ = names("example")
+    make_cpp_pkg(root, cpp_package_name, library_name, "LOCAL")
+
+    env = VEnv(root, package_wheelhouse)
+    env.wheel(root / cpp_package_name, build_isolation=False)
+    env.install((cpp_package_name, "shared_lib_consumer"), "--no-index")
+    env.run(
+        f"""
+        import importlib
+        import sys
+        import tempfile
+        from pathlib import Path
+
+        import shared_lib_consumer
+        import {cpp_package_name}
+
+        class RecordingLoader:
+            def __init__(self, loader):
+                self.loader = loader
+                self.calls = []
+
+            def load(self, **kwargs):
+                self.calls.append(kwargs)
+                self.loader.load(**kwargs)
+
+        # Installed modules are loaded every time, including after the first lookup.
+        loader = RecordingLoader({cpp_package_name}.loader)
+        {cpp_package_name}.loader = loader
+        shared_lib_consumer.load_library_module("{cpp_package_name}")
+        shared_lib_consumer.load_library_module(
+            "{cpp_package_name}", prefer_system=True
+        )
+        assert loader.calls == [{{"prefer_system": False}}, {{"prefer_system": True}}]
+
+        extra_path = Path(tempfile.mkdtemp())
+        sys.path.append(str(extra_path))
+
+        # Missing modules are skipped, and they stay missing even once they appear.
+        shared_lib_consumer.load_library_module("late_library")
+        (extra_path / "late_library.py").write_text("raise RuntimeError")
+        importlib.invalidate_caches()
+        shared_lib_consumer.load_library_module("late_library")
+
+        # A missing dependency of the module is not mistaken for the module itself.
+        (extra_path / "broken_library.py").write_text("import missing_dependency")
+        importlib.invalidate_caches()
+        try:
+            shared_lib_consumer.load_library_module("broken_library")
+        except ModuleNotFoundError as e:
+            assert e.name == "missing_dependency", e
+        else:
+            raise AssertionError("The missing dependency was not reported")
+        """,
+    )
+
+
+def test_repeated_load(package_wheelhouse: Path) -> None:
+    """Show that loading the libraries of a loader again opens nothing new."""
+    loader_behavior_test(
+        package_wheelhouse,
+        "repeated_load",
+        """
+        loader = make_loader()
+        loader.load()
+        assert len(opened) == 1, opened
+        # Even a system library is not tried for a library that is already loaded.
+        loader.load()
+        loader.load(["example"], prefer_system=True)
+        assert len(opened) == 1, opened
+        """,
+    )
+
+
+def test_shared_handles(package_wheelhouse: Path) -> None:
+    """Show that loaders of the same library share a single handle to it."""
+    loader_behavior_test(
+        package_wheelhouse,
+        "shared_handles",
+        """
+        make_loader().load()
+        make_loader().load()
+        assert len(opened) == 1, opened
+        """,
+    )
+
+
+def test_remembered_system_miss(package_wheelhouse: Path) -> None:
+    """Show that a system library that could not be found is not looked for again."""
+    loader_behavior_test(
+        package_wheelhouse,
+        "remembered_system_miss",
+        """
+        # There is no system copy, so the bundled library is loaded after the miss.
+        make_loader().load(prefer_system=True)
+        assert len(opened) == 2, opened
+        assert opened[0] == Path(opened[1]).name, opened
+
+        # A lookup by name would now find the bundled library, so only the remembered
+        # miss keeps a new loader from trying the system library again.
+        make_loader().load(prefer_system=True)
+        assert len(opened) == 2, opened
+        """,
+    )
+
+
+# Shared libraries on other platforms cannot be linked with undefined symbols.
+@pytest.mark.skipif(
+    platform.system() != "Linux", reason="Undefined symbols only supported on Linux"
+)
+def test_lazy_loading(package_wheelhouse: Path) -> None:
+    """Show that lazy loading defers resolving symbols until they are used."""
+    lazy_loading_test(package_wheelhouse, lazy=True)
+
+    with pytest.raises(subprocess.CalledProcessError) as e:
+        lazy_loading_test(package_wheelhouse, lazy=False)
+    assert "undefined symbol" in e.value.stderr.decode()
+
+
 @pytest.mark.skipif(
     platform.system() != "Windows", reason="This test is Windows-specific"
 )